@@ -7,18 +7,28 @@ Interactive dashboard with three visualizations:
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from pathlib import Path
 import plotly.graph_objects as go
+import plotly.io as pio
 
 # Import chart functions
 from components.charts import (
     create_choropleth,
     create_animated_airline_chart,
     create_sunburst,
+    ANIMATION_METRICS,
     COLORS
 )
 
+# Serialize every figure (st.plotly_chart and the cached animation HTML)
+# with orjson, which encodes numpy arrays natively
+pio.json.config.default_engine = 'orjson'
+
 # ============================================
 # PAGE CONFIGURATION
 # ============================================
@@ -198,31 +208,172 @@ st.markdown("""
 # DATA LOADING
 # ============================================
 
+# Columns read from each file (None = all) and pandas dtypes applied on load.
+# Numeric types are stored in the Parquet files already; only the
+# low-cardinality label columns are converted to categoricals here.
+SCHEMAS = {
+    'state_metrics': {
+        'columns': ['StateCode', 'StateName', 'FlightCount', 'AvgDepDelay', 'CancellationRate'],
+        'dtype': {'StateCode': 'category'}
+    },
+    'daily_airline_metrics': {
+        'columns': ['Day', 'Airline', 'FlightCount', 'AvgDepDelay', 'OnTimeRate', 'CancellationRate'],
+        'dtype': {'Airline': 'category'}
+    },
+    'hierarchy_data': {
+        'columns': ['State', 'City', 'Airport', 'Airline', 'FlightCount', 'AvgDelay'],
+        'dtype': {'State': 'category', 'City': 'category', 'Airport': 'category', 'Airline': 'category'}
+    },
+    'airline_metrics': {
+        'columns': None,
+        'dtype': {}
+    },
+    'summary_stats': {
+        'columns': ['TotalFlights', 'AvgDepartureDelay', 'AvgArrivalDelay', 'CancellationRate', 'TotalCancelled'],
+        'dtype': {}
+    }
+}
+
+def aggregate_hierarchy(table):
+    """
+    Collapse hierarchy rows to one per State/City/Airport/Airline leaf
+    
+    Runs on the Arrow table so the grouping uses Arrow's vectorized kernels.
+    AvgDelay is re-weighted by flight count so merged rows keep a true mean,
+    and rows come back sorted along the path.
+    """
+    path = ['State', 'City', 'Airport', 'Airline']
+    table = table.append_column(
+        'DelayMinutes',
+        pc.multiply(pc.cast(table['AvgDelay'], pa.float64()), table['FlightCount'])
+    )
+    grouped = table.group_by(path).aggregate([
+        ('FlightCount', 'sum'),
+        ('DelayMinutes', 'sum')
+    ]).sort_by([(col, 'ascending') for col in path])
+    avg_delay = pc.divide(grouped['DelayMinutes_sum'], grouped['FlightCount_sum'])
+    
+    return pa.table({
+        **{col: grouped[col] for col in path},
+        'FlightCount': pc.cast(grouped['FlightCount_sum'], pa.int32()),
+        'AvgDelay': pc.cast(avg_delay, pa.float32())
+    })
+
 @st.cache_data
 def load_data():
-    """Load all required data files"""
+    """Load all required data files (Parquet, see convert_to_parquet.py)"""
     data_dir = Path(__file__).parent / "data" / "aggregated"
     
+    def read_table(name):
+        columns = SCHEMAS[name]['columns']
+        return pq.read_table(data_dir / f"{name}.parquet", columns=columns, use_threads=True)
+    
+    def to_frame(name, table):
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        return df.astype(SCHEMAS[name]['dtype'])
+    
+    def read_parquet(name):
+        return to_frame(name, read_table(name))
+    
+    daily_airline_metrics = read_parquet("daily_airline_metrics")
+    hierarchy_data = to_frame("hierarchy_data", aggregate_hierarchy(read_table("hierarchy_data")))
+    all_states = list(hierarchy_data['State'].cat.categories)
+    
+    # Sunburst input per state filter, so a state pick is a dict lookup
+    hierarchy_slices = {'All States': hierarchy_data}
+    for state in all_states:
+        state_rows = hierarchy_data[hierarchy_data['State'] == state]
+        hierarchy_slices[state] = state_rows.reset_index(drop=True)
+    
     return {
-        'state_metrics': pd.read_csv(data_dir / "state_metrics.csv"),
-        'daily_airline_metrics': pd.read_csv(data_dir / "daily_airline_metrics.csv"),
-        'hierarchy_data': pd.read_csv(data_dir / "hierarchy_data.csv"),
-        'airline_metrics': pd.read_csv(data_dir / "airline_metrics.csv"),
-        'summary_stats': pd.read_csv(data_dir / "summary_stats.csv")
+        'state_metrics': read_parquet("state_metrics"),
+        'daily_airline_metrics': daily_airline_metrics,
+        'hierarchy_data': hierarchy_data,
+        'airline_metrics': read_parquet("airline_metrics"),
+        # Single-row KPI table, kept as plain Python scalars
+        'summary': read_table("summary_stats").to_pylist()[0],
+        # Filter options (categories are already sorted and unique)
+        'all_airlines': list(daily_airline_metrics['Airline'].cat.categories),
+        'all_states': all_states,
+        # Unfiltered per-metric maxima for the animation's x-axis range
+        'metric_max': {
+            metric: float(daily_airline_metrics[metric].to_numpy().max())
+            for metric in ANIMATION_METRICS
+        },
+        'hierarchy_slices': hierarchy_slices
     }
 
+@st.cache_resource
+def load_sorted_frames():
+    """Memory-map the pre-sorted animation frames (see build_sorted_frames.py)"""
+    data_dir = Path(__file__).parent / "data" / "aggregated"
+    
+    frames = {}
+    for metric in ANIMATION_METRICS:
+        source = pa.memory_map(str(data_dir / f"daily_airline_metrics__{metric}.arrow"))
+        frames[metric] = pa.ipc.open_file(source).read_all()
+    return frames
+
 # Load data
 try:
     data = load_data()
+    sorted_frames = load_sorted_frames()
     state_metrics = data['state_metrics']
     daily_airline_metrics = data['daily_airline_metrics']
     hierarchy_data = data['hierarchy_data']
     airline_metrics = data['airline_metrics']
-    summary_stats = data['summary_stats']
 except Exception as e:
     st.error(f"Error loading data: {e}")
     st.stop()
 
+# ============================================
+# CHART CACHING
+# ============================================
+
+# Figures only depend on their own controls, so cache them per widget state.
+# DataFrames come from the cached load_data() and never change, so they are
+# passed with a leading underscore to skip hashing them on every rerun.
+
+@st.cache_data(show_spinner=False)
+def cached_choropleth(_state_metrics, metric):
+    """Cached choropleth figure keyed by map metric"""
+    return create_choropleth(_state_metrics, metric=metric)
+
+@st.cache_data(show_spinner=False)
+def cached_animation_html(_sorted_frames, _metric_max, metric, selected_airlines):
+    """
+    Cached animated airline chart as a standalone Plotly.js snippet
+    
+    The animation is by far the largest figure, so it is serialized once per
+    metric/airline selection here instead of by st.plotly_chart on every rerun.
+    """
+    table = _sorted_frames[metric]
+    # Filter on the Arrow table so only the selected rows are converted
+    if selected_airlines:
+        table = table.filter(pc.is_in(table['Airline'], value_set=pa.array(selected_airlines)))
+    
+    fig = create_animated_airline_chart(
+        table.to_pandas(types_mapper=pd.ArrowDtype),
+        metric=metric,
+        presorted=True,
+        max_value=None if selected_airlines else _metric_max[metric]
+    )
+    return pio.to_html(
+        fig,
+        include_plotlyjs='cdn',
+        full_html=False,
+        auto_play=False,
+        config={'responsive': True}
+    )
+
+@st.cache_data(show_spinner=False)
+def cached_sunburst(_hierarchy_slices, selected_state):
+    """Cached sunburst figure keyed by state filter ('All States' = no filter)"""
+    return create_sunburst(
+        _hierarchy_slices[selected_state],
+        selected_state=None if selected_state == 'All States' else selected_state
+    )
+
 # ============================================
 # HEADER
 # ============================================
@@ -241,7 +392,7 @@ st.markdown("""
 st.markdown("### Key Performance Indicators")
 
 # Get summary statistics
-stats = summary_stats.to_dict('records')[0]
+stats = data['summary']
 avg_delay = stats.get('AvgDepartureDelay', 0)
 cancel_rate = stats.get('CancellationRate', 0)
 total_cancelled = int(stats.get('TotalCancelled', 0))
@@ -308,37 +459,42 @@ Each visualization has its own filters and controls located directly above the c
 
 st.markdown("## US Flight Metrics by State")
 
-# Map controls - positioned above the map
-col1, col2, col3 = st.columns([1, 2, 1])
-with col2:
-    map_metric = st.selectbox(
-        "Map Metric",
-        options=['AvgDepDelay', 'CancellationRate', 'FlightCount'],
-        format_func=lambda x: {
-            'AvgDepDelay': 'Average Delay',
-            'CancellationRate': 'Cancellation Rate',
-            'FlightCount': 'Flight Volume'
-        }[x],
-        key="map_metric",
-        help="Select which metric to display on the map"
-    )
-
-st.markdown(f"""
-    <p class="section-subtitle">
-        Interactive map showing {
-            'average departure delay' if map_metric == 'AvgDepDelay' 
-            else 'cancellation rate' if map_metric == 'CancellationRate'
-            else 'total flight volume'
-        } across all US states
-    </p>
-""", unsafe_allow_html=True)
-
-# Create and display choropleth
-try:
-    fig_map = create_choropleth(state_metrics, metric=map_metric)
-    st.plotly_chart(fig_map, use_container_width=True, key="choropleth")
-except Exception as e:
-    st.error(f"Error creating map: {e}")
+@st.fragment
+def map_section():
+    """Map controls and chart; reruns on its own when the map metric changes"""
+    # Map controls - positioned above the map
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        map_metric = st.selectbox(
+            "Map Metric",
+            options=['AvgDepDelay', 'CancellationRate', 'FlightCount'],
+            format_func=lambda x: {
+                'AvgDepDelay': 'Average Delay',
+                'CancellationRate': 'Cancellation Rate',
+                'FlightCount': 'Flight Volume'
+            }[x],
+            key="map_metric",
+            help="Select which metric to display on the map"
+        )
+
+    st.markdown(f"""
+        <p class="section-subtitle">
+            Interactive map showing {
+                'average departure delay' if map_metric == 'AvgDepDelay' 
+                else 'cancellation rate' if map_metric == 'CancellationRate'
+                else 'total flight volume'
+            } across all US states
+        </p>
+    """, unsafe_allow_html=True)
+
+    # Create and display choropleth
+    try:
+        fig_map = cached_choropleth(state_metrics, map_metric)
+        st.plotly_chart(fig_map, use_container_width=True, key="choropleth")
+    except Exception as e:
+        st.error(f"Error creating map: {e}")
+
+map_section()
 
 st.markdown("---")
 
@@ -348,51 +504,57 @@ st.markdown("---")
 
 st.markdown("## Daily Airline Performance Animation")
 
-# Animation controls - positioned above the chart
-col1, col2 = st.columns(2)
-
-with col1:
-    # Get unique airlines for multiselect
-    all_airlines = sorted(daily_airline_metrics['Airline'].unique().tolist())
-    selected_airlines = st.multiselect(
-        "Select Airlines",
-        options=all_airlines,
-        default=[],
-        key="selected_airlines",
-        help="Select specific airlines to display (leave empty to show all)"
-    )
-
-with col2:
-    animation_metric = st.selectbox(
-        "Select Metric",
-        options=['FlightCount', 'AvgDepDelay', 'OnTimeRate'],
-        format_func=lambda x: {
-            'FlightCount': 'Flight Count',
-            'AvgDepDelay': 'Avg Delay (min)',
-            'OnTimeRate': 'On-Time %'
-        }[x],
-        key="animation_metric",
-        help="Select which metric to animate over time"
-    )
-
-st.markdown("""
-    <p class="section-subtitle">
-        Compare airlines day by day with animated bar chart
-    </p>
-""", unsafe_allow_html=True)
-
-# Create and display animated chart
-try:
-    fig_animation = create_animated_airline_chart(
-        daily_airline_metrics,
-        metric=animation_metric,
-        selected_airlines=selected_airlines if selected_airlines else None
-    )
-    st.plotly_chart(fig_animation, use_container_width=True, key="animation")
-    
-    st.info("**Tip**: Click the play button to see how airlines compare over time!")
-except Exception as e:
-    st.error(f"Error creating animated chart: {e}")
+@st.fragment
+def animation_section():
+    """Animation controls and chart; reruns on its own when its filters change"""
+    # Animation controls - positioned above the chart
+    col1, col2 = st.columns(2)
+
+    with col1:
+        selected_airlines = st.multiselect(
+            "Select Airlines",
+            options=data['all_airlines'],
+            default=[],
+            key="selected_airlines",
+            help="Select specific airlines to display (leave empty to show all)"
+        )
+
+    with col2:
+        animation_metric = st.selectbox(
+            "Select Metric",
+            options=['FlightCount', 'AvgDepDelay', 'OnTimeRate'],
+            format_func=lambda x: {
+                'FlightCount': 'Flight Count',
+                'AvgDepDelay': 'Avg Delay (min)',
+                'OnTimeRate': 'On-Time %'
+            }[x],
+            key="animation_metric",
+            help="Select which metric to animate over time"
+        )
+
+    st.markdown("""
+        <p class="section-subtitle">
+            Compare airlines day by day with animated bar chart
+        </p>
+    """, unsafe_allow_html=True)
+
+    # Create and display animated chart
+    try:
+        # Rendered from cached HTML rather than st.plotly_chart to skip re-encoding
+        # the figure; this chart has no Streamlit-side selection events to lose
+        animation_html = cached_animation_html(
+            sorted_frames,
+            data['metric_max'],
+            animation_metric,
+            tuple(sorted(selected_airlines))
+        )
+        components.html(animation_html, height=520)
+        
+        st.info("**Tip**: Click the play button to see how airlines compare over time!")
+    except Exception as e:
+        st.error(f"Error creating animated chart: {e}")
+
+animation_section()
 
 st.markdown("---")
 
@@ -402,35 +564,35 @@ st.markdown("---")
 
 st.markdown("## Flight Volume Hierarchy")
 
-# Sunburst controls - positioned above the chart
-col1, col2, col3 = st.columns([1, 2, 1])
-with col2:
-    # Get unique states for filter
-    all_states = sorted(hierarchy_data['State'].unique().tolist())
-    selected_state = st.selectbox(
-        "Filter by State",
-        options=['All States'] + all_states,
-        key="selected_state",
-        help="Filter the hierarchy to show only a specific state"
-    )
-
-# Convert 'All States' to None for the function
-sunburst_state = None if selected_state == 'All States' else selected_state
-
-st.markdown("""
-    <p class="section-subtitle">
-        Drill down through the hierarchy: State → City → Airport → Airline
-    </p>
-""", unsafe_allow_html=True)
-
-# Create and display sunburst
-try:
-    fig_sunburst = create_sunburst(hierarchy_data, selected_state=sunburst_state)
-    st.plotly_chart(fig_sunburst, use_container_width=True, key="sunburst")
-    
-    st.info("**Tip**: Click on any segment to zoom in and explore the hierarchy!")
-except Exception as e:
-    st.error(f"Error creating sunburst chart: {e}")
+@st.fragment
+def sunburst_section():
+    """Sunburst controls and chart; reruns on its own when the state filter changes"""
+    # Sunburst controls - positioned above the chart
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        selected_state = st.selectbox(
+            "Filter by State",
+            options=['All States'] + data['all_states'],
+            key="selected_state",
+            help="Filter the hierarchy to show only a specific state"
+        )
+
+    st.markdown("""
+        <p class="section-subtitle">
+            Drill down through the hierarchy: State → City → Airport → Airline
+        </p>
+    """, unsafe_allow_html=True)
+
+    # Create and display sunburst
+    try:
+        fig_sunburst = cached_sunburst(data['hierarchy_slices'], selected_state)
+        st.plotly_chart(fig_sunburst, use_container_width=True, key="sunburst")
+        
+        st.info("**Tip**: Click on any segment to zoom in and explore the hierarchy!")
+    except Exception as e:
+        st.error(f"Error creating sunburst chart: {e}")
+
+sunburst_section()
 
 # ============================================
 # FOOTER
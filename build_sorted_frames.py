@@ -0,0 +1,40 @@
+"""
+Precompute the animated airline chart's sorted frames as Arrow IPC files
+Run once after regenerating the aggregated data:
+
+    python build_sorted_frames.py
+
+Writes one daily_airline_metrics__<metric>.arrow file per animation metric,
+already ordered the way create_animated_airline_chart needs them.
+"""
+
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from components.charts import ANIMATION_METRICS, sort_daily_airline_frame
+
+DATA_DIR = Path(__file__).parent / "data" / "aggregated"
+
+
+def sorted_frame_path(data_dir, metric):
+    """Location of the pre-sorted Arrow file for a metric"""
+    return data_dir / f"daily_airline_metrics__{metric}.arrow"
+
+
+def build_all(data_dir=DATA_DIR):
+    """Write one pre-sorted Arrow IPC file per animation metric"""
+    daily_airline_df = pq.read_table(data_dir / "daily_airline_metrics.parquet").to_pandas()
+    
+    for metric in ANIMATION_METRICS:
+        sorted_df = sort_daily_airline_frame(daily_airline_df, metric)
+        table = pa.Table.from_pandas(sorted_df, preserve_index=False)
+        path = sorted_frame_path(data_dir, metric)
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        print(f"{metric} -> {path.name}")
+
+
+if __name__ == "__main__":
+    build_all()
@@ -3,7 +3,6 @@ Chart generation functions for Streamlit Flight Dashboard
 All Plotly visualizations are defined here
 """
 
-import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
@@ -25,8 +24,16 @@ COLORS = {
     'text_muted': '#14b8a6',        # teal-500 - muted text
     'grid': '#e2e8f0',              # slate-200 - subtle gridlines
     'border': '#99f6e4',            # teal-200 - card borders
-    'sequential': px.colors.sequential.Tealgrn,
-    'diverging': px.colors.diverging.RdYlGn_r,
+    # Plotly's Tealgrn and RdYlGn_r scales, inlined so plotly.express isn't imported
+    'sequential': [
+        'rgb(176, 242, 188)', 'rgb(137, 232, 172)', 'rgb(103, 219, 165)', 'rgb(76, 200, 163)',
+        'rgb(56, 178, 163)', 'rgb(44, 152, 160)', 'rgb(37, 125, 152)'
+    ],
+    'diverging': [
+        'rgb(0,104,55)', 'rgb(26,152,80)', 'rgb(102,189,99)', 'rgb(166,217,106)',
+        'rgb(217,239,139)', 'rgb(255,255,191)', 'rgb(254,224,139)', 'rgb(253,174,97)',
+        'rgb(244,109,67)', 'rgb(215,48,39)', 'rgb(165,0,38)'
+    ],
     # Distinct colors for categorical data (airlines) - maximum distinguishability
     'chart_palette': [
         '#0d9488',  # teal
@@ -42,6 +49,33 @@ COLORS = {
     ]
 }
 
+# Metrics offered by the animated airline chart
+ANIMATION_METRICS = ['FlightCount', 'AvgDepDelay', 'OnTimeRate']
+
+# Layout shared by every chart; each create_* applies it first and then only
+# sets its own fields (title text, height, margins, ...)
+BASE_LAYOUT = dict(
+    title=dict(font=dict(color=COLORS['text']), x=0.5, xanchor='center'),
+    paper_bgcolor=COLORS['background'],
+    plot_bgcolor=COLORS['background'],
+    font=dict(color=COLORS['text'])
+)
+
+# Each map label is an SVG <text> node; beyond this many regions only the
+# busiest ones are labelled
+MAX_MAP_LABELS = 60
+
+
+def sort_daily_airline_frame(daily_airline_df, metric):
+    """
+    Order daily airline rows for the bar chart race
+    
+    Rows are sorted by day, then by metric - for delay/cancellation,
+    descending shows worst performers at top
+    """
+    ascending_metric = metric in ['FlightCount', 'OnTimeRate']
+    return daily_airline_df.sort_values(['Day', metric], ascending=[True, not ascending_metric])
+
 # ============================================
 # 1. US STATE CHOROPLETH MAP
 # ============================================
@@ -81,67 +115,68 @@ def create_choropleth(state_metrics_df, metric='AvgDepDelay'):
     
     config = metric_config.get(metric, metric_config['AvgDepDelay'])
     
-    fig = px.choropleth(
-        state_metrics_df,
-        locations='StateCode',
+    # Format hover/label values once (column-wise) so Plotly.js only interpolates strings
+    value_fmt = f"{{:{config['value_format']}}}"
+    value_text = state_metrics_df[metric].map(value_fmt.format)
+    flights_text = state_metrics_df['FlightCount'].map('{:,.0f}'.format)
+    
+    choropleth = go.Choropleth(
+        locations=state_metrics_df['StateCode'].to_numpy(),
+        z=state_metrics_df[metric].to_numpy(),
         locationmode='USA-states',
-        color=metric,
-        scope='usa',
-        color_continuous_scale=config['color_scale'],
-        labels=config['labels'],
-        hover_data={
-            'StateCode': False,
-            'StateName': True,
-            'FlightCount': ':,',
-            metric: f':{config["value_format"]}'
-        }
+        coloraxis='coloraxis',
+        customdata=np.column_stack([
+            state_metrics_df['StateName'].to_numpy(),
+            value_text.to_numpy(),
+            flights_text.to_numpy()
+        ]),
+        hovertemplate='<b>%{customdata[0]}</b><br>' +
+                     f'{config["labels"]["z"]}: %{{customdata[1]}}{config["hover_suffix"]}<br>' +
+                     'Total Flights: %{customdata[2]}<extra></extra>'
     )
     
+    # Add labels for state name and metric value on the map
+    label_text = state_metrics_df['StateName'] + '<br>' + value_text + config['hover_suffix']
+    label_rows = state_metrics_df.index
+    if len(state_metrics_df) > MAX_MAP_LABELS:
+        label_rows = state_metrics_df['FlightCount'].nlargest(MAX_MAP_LABELS).index
+    labels = go.Scattergeo(
+        locations=state_metrics_df.loc[label_rows, 'StateCode'],
+        locationmode='USA-states',
+        text=label_text.loc[label_rows],
+        mode='text',
+        textfont=dict(color='white', size=9, family='Arial', weight='bold'),
+        hoverinfo='skip',
+        showlegend=False
+    )
+    
+    fig = go.Figure(data=[choropleth, labels])
+    
+    fig.update_layout(BASE_LAYOUT)
     fig.update_layout(
         title=dict(
             text=config['title'],
-            font=dict(size=18, color=COLORS['text']),
-            x=0.5,
-            xanchor='center'
+            font=dict(size=18)
         ),
         geo=dict(
+            scope='usa',
             bgcolor=COLORS['surface'],
             lakecolor=COLORS['background'],
             landcolor=COLORS['surface'],
             showcountries=False,
             showlakes=True
         ),
-        paper_bgcolor=COLORS['background'],
-        plot_bgcolor=COLORS['background'],
-        font=dict(color=COLORS['text']),
         margin=dict(l=0, r=0, t=50, b=0),
         height=500,
-        coloraxis_colorbar=dict(
-            title=dict(text=config['labels']['z'], font=dict(size=12)),
-            tickfont=dict(size=10)
+        coloraxis=dict(
+            colorscale=config['color_scale'],
+            colorbar=dict(
+                title=dict(text=config['labels']['z'], font=dict(size=12)),
+                tickfont=dict(size=10)
+            )
         )
     )
     
-    fig.update_traces(
-        hovertemplate='<b>%{customdata[0]}</b><br>' +
-                     f'{config["labels"]["z"]}: %{{z:{config["value_format"]}}}{config["hover_suffix"]}<br>' +
-                     'Total Flights: %{customdata[1]:,}<extra></extra>'
-    )
-
-    # Add labels for state name and metric value on the map
-    fig.add_trace(go.Scattergeo(
-        locations=state_metrics_df['StateCode'],
-        locationmode='USA-states',
-        text=state_metrics_df.apply(
-            lambda row: f"{row['StateName']}<br>{row[metric]:{config['value_format']}}{config['hover_suffix']}",
-            axis=1
-        ),
-        mode='text',
-        textfont=dict(color='white', size=9, family='Arial', weight='bold'),
-        hoverinfo='skip',
-        showlegend=False
-    ))
-    
     return fig
 
 
@@ -149,7 +184,8 @@ def create_choropleth(state_metrics_df, metric='AvgDepDelay'):
 # 2. ANIMATED AIRLINE PERFORMANCE (Bar Chart Race)
 # ============================================
 
-def create_animated_airline_chart(daily_airline_df, metric='FlightCount', selected_airlines=None):
+def create_animated_airline_chart(daily_airline_df, metric='FlightCount', selected_airlines=None,
+                                  presorted=False, max_value=None):
     """
     Create animated bar chart showing daily airline performance over the month
     
@@ -157,6 +193,8 @@ def create_animated_airline_chart(daily_airline_df, metric='FlightCount', select
         daily_airline_df: DataFrame with daily airline metrics
         metric: Which metric to show ('FlightCount', 'AvgDepDelay', 'OnTimeRate')
         selected_airlines: List of airlines to include (None = all)
+        presorted: True if daily_airline_df is already ordered by sort_daily_airline_frame
+        max_value: Precomputed maximum of metric over the plotted rows (None = compute it)
     """
     # Metric configuration
     metric_config = {
@@ -185,45 +223,85 @@ def create_animated_airline_chart(daily_airline_df, metric='FlightCount', select
     
     config = metric_config.get(metric, metric_config['FlightCount'])
     
-    # Filter airlines if specified
-    df = daily_airline_df.copy()
-    if selected_airlines and len(selected_airlines) > 0:
+    # Filter airlines if specified (the input is never mutated, so no copy is needed)
+    df = daily_airline_df
+    if selected_airlines:
         df = df[df['Airline'].isin(selected_airlines)]
     
     # Calculate x-axis range based on filtered data (with 10% padding)
-    max_value = df[metric].max()
+    if max_value is None:
+        max_value = float(df[metric].to_numpy().max())
     x_range_max = max_value * 1.1 if max_value > 0 else 100
     
-    # Sort data - for delay/cancellation, descending shows worst performers at top
-    ascending_metric = metric in ['FlightCount', 'OnTimeRate']
-    df = df.sort_values(['Day', metric], ascending=[True, not ascending_metric])
-    
-    # Create animated bar chart
-    fig = px.bar(
-        df,
-        x=metric,
-        y='Airline',
-        color='Airline',
-        animation_frame='Day',
-        orientation='h',
-        color_discrete_sequence=COLORS['chart_palette'],
-        hover_data={
-            'Airline': False,
-            'Day': True,
-            'FlightCount': ':,',
-            'AvgDepDelay': ':.1f',
-            'OnTimeRate': ':.1f',
-            'CancellationRate': ':.2f'
-        }
+    # Sort data unless it comes pre-sorted (see build_sorted_frames.py)
+    if not presorted:
+        df = sort_daily_airline_frame(df, metric)
+    
+    # Color each airline consistently across frames (order of first appearance)
+    palette = COLORS['chart_palette']
+    airline_colors = {
+        airline: palette[i % len(palette)]
+        for i, airline in enumerate(df['Airline'].unique())
+    }
+    
+    hovertemplate = (
+        '<b>%{y}</b><br>' +
+        f'{config["x_label"]}: %{{x{config["format"]}}}{config["suffix"]}<br>' +
+        'Day: %{customdata[0]}<br>' +
+        'Daily Flights: %{customdata[1]}<br>' +
+        'Avg Delay: %{customdata[2]} min<br>' +
+        'On-Time: %{customdata[3]}%<br>' +
+        'Cancellation: %{customdata[4]}%<extra></extra>'
+    )
+    
+    # Hover values are pre-formatted so Plotly.js only interpolates strings
+    hover_text = np.column_stack([
+        df['Day'].map('{}'.format).to_numpy(),
+        df['FlightCount'].map('{:,.0f}'.format).to_numpy(),
+        df['AvgDepDelay'].map('{:.1f}'.format).to_numpy(),
+        df['OnTimeRate'].map('{:.1f}'.format).to_numpy(),
+        df['CancellationRate'].map('{:.2f}'.format).to_numpy()
+    ])
+    
+    # Scatter rows into dense (day, airline) matrices so each frame is one
+    # contiguous row; airlines without flights on a day stay empty
+    airlines = list(airline_colors)
+    days, day_idx = np.unique(df['Day'].to_numpy(), return_inverse=True)
+    airline_idx = df['Airline'].map({airline: i for i, airline in enumerate(airlines)}).to_numpy(dtype=int)
+    x_matrix = np.full((len(days), len(airlines)), np.nan)
+    x_matrix[day_idx, airline_idx] = df[metric].to_numpy(dtype=float)
+    hover_matrix = np.full((len(days), len(airlines), hover_text.shape[1]), '', dtype=object)
+    hover_matrix[day_idx, airline_idx] = hover_text
+    
+    # Frames only carry what changes per day; the airline axis, colors and
+    # hover template live on the base trace and are reused by every frame
+    frames = [
+        go.Frame(
+            data=[go.Bar(x=x_matrix[i], customdata=hover_matrix[i])],
+            name=str(day)
+        )
+        for i, day in enumerate(days)
+    ]
+    
+    fig = go.Figure(
+        data=[go.Bar(
+            x=x_matrix[0],
+            y=airlines,
+            orientation='h',
+            marker=dict(color=[airline_colors[airline] for airline in airlines]),
+            customdata=hover_matrix[0],
+            hovertemplate=hovertemplate,
+            cliponaxis=False  # bars stay inside the fixed range; skip per-frame clipping
+        )],
+        frames=frames
     )
     
     # Update layout for clean appearance
+    fig.update_layout(BASE_LAYOUT)
     fig.update_layout(
         title=dict(
             text=f"{config['title']}<br><sub>{config['subtitle']}</sub>",
-            font=dict(size=16, color=COLORS['text']),
-            x=0.5,
-            xanchor='center'
+            font=dict(size=16)
         ),
         xaxis=dict(
             title=dict(text=config['x_label'], font=dict(color=COLORS['text'])),
@@ -236,36 +314,58 @@ def create_animated_airline_chart(daily_airline_df, metric='FlightCount', select
             categoryorder='total ascending',
             tickfont=dict(color=COLORS['text'], size=10)
         ),
-        paper_bgcolor=COLORS['background'],
         plot_bgcolor=COLORS['surface'],
-        font=dict(color=COLORS['text']),
         height=500,
         showlegend=False,
-        margin=dict(l=150, r=20, t=80, b=60)
+        margin=dict(l=150, r=20, t=80, b=60),
+        uirevision='const'  # keep axes/UI state across frame redraws
     )
     
-    # Update hover template
-    fig.update_traces(
-        hovertemplate='<b>%{y}</b><br>' +
-                     f'{config["x_label"]}: %{{x{config["format"]}}}{config["suffix"]}<br>' +
-                     'Day: %{customdata[0]}<br>' +
-                     'Daily Flights: %{customdata[1]:,}<br>' +
-                     'Avg Delay: %{customdata[2]:.1f} min<br>' +
-                     'On-Time: %{customdata[3]:.1f}%<br>' +
-                     'Cancellation: %{customdata[4]:.2f}%<extra></extra>'
+    # Play/pause buttons and day slider (same controls px.bar generates)
+    play_args = dict(
+        frame=dict(duration=400, redraw=True),
+        mode='immediate',
+        fromcurrent=True,
+        transition=dict(duration=150, easing='linear')
+    )
+    step_args = dict(
+        frame=dict(duration=0, redraw=True),
+        mode='immediate',
+        fromcurrent=True,
+        transition=dict(duration=0, easing='linear')
     )
     
-    # Customize animation settings
-    fig.layout.updatemenus[0].buttons[0].args[1]["frame"]["duration"] = 400
-    fig.layout.updatemenus[0].buttons[0].args[1]["transition"]["duration"] = 150
-    
-    # Style the animation slider
-    if fig.layout.sliders:
-        fig.layout.sliders[0].currentvalue = dict(
-            prefix="Day: ",
-            font=dict(color=COLORS['text'], size=14)
-        )
-        fig.layout.sliders[0].font = dict(color=COLORS['text'])
+    fig.update_layout(
+        updatemenus=[dict(
+            type='buttons',
+            buttons=[
+                dict(label='&#9654;', method='animate', args=[None, play_args]),
+                dict(label='&#9724;', method='animate', args=[[None], step_args])
+            ],
+            direction='left',
+            pad=dict(r=10, t=70),
+            showactive=False,
+            x=0.1,
+            xanchor='right',
+            y=0,
+            yanchor='top'
+        )],
+        sliders=[dict(
+            active=0,
+            currentvalue=dict(prefix="Day: ", font=dict(color=COLORS['text'], size=14)),
+            font=dict(color=COLORS['text']),
+            len=0.9,
+            pad=dict(b=10, t=60),
+            x=0.1,
+            xanchor='left',
+            y=0,
+            yanchor='top',
+            steps=[
+                dict(label=frame.name, method='animate', args=[[frame.name], step_args])
+                for frame in frames
+            ]
+        )]
+    )
     
     return fig
 
@@ -274,19 +374,54 @@ def create_animated_airline_chart(daily_airline_df, metric='FlightCount', select
 # 3. HIERARCHICAL SUNBURST
 # ============================================
 
+def build_hierarchy_tree(hierarchy_df, path):
+    """
+    Flatten leaf rows into one sunburst node per path prefix
+    
+    Parent nodes sum FlightCount and take the flight-weighted mean of AvgDelay
+    (the same aggregation px.sunburst performs).
+    
+    Args:
+        hierarchy_df: DataFrame with one row per leaf, plus FlightCount and AvgDelay
+        path: Hierarchy columns from root to leaf
+    
+    Returns:
+        DataFrame with id, parent, label, FlightCount and AvgDelay columns
+    """
+    df = hierarchy_df[path].astype(str)
+    df['FlightCount'] = hierarchy_df['FlightCount'].to_numpy(dtype=float)
+    df['DelayMinutes'] = hierarchy_df['AvgDelay'].to_numpy(dtype=float) * df['FlightCount']
+    
+    levels = []
+    for depth in range(len(path), 0, -1):
+        keys = path[:depth]
+        level = df.groupby(keys, sort=True)[['FlightCount', 'DelayMinutes']].sum().reset_index()
+        
+        parent = level[keys[0]] if depth > 1 else ''
+        for col in keys[1:-1]:
+            parent = parent + '/' + level[col]
+        
+        levels.append(pd.DataFrame({
+            'id': level[keys[-1]] if depth == 1 else parent + '/' + level[keys[-1]],
+            'parent': parent,
+            'label': level[keys[-1]],
+            'FlightCount': level['FlightCount'],
+            'AvgDelay': level['DelayMinutes'] / level['FlightCount']
+        }))
+    
+    return pd.concat(levels, ignore_index=True)
+
+
 def create_sunburst(hierarchy_df, selected_state=None):
     """
     Create interactive sunburst chart
     Hierarchy: State → City → Airport → Airline
     
     Args:
-        hierarchy_df: DataFrame with hierarchical data
-        selected_state: Optional state filter
+        hierarchy_df: DataFrame with hierarchical data, already limited to
+            selected_state when one is given
+        selected_state: Optional state the data was filtered to (used in the subtitle)
     """
-    # Filter by state if selected
-    if selected_state:
-        hierarchy_df = hierarchy_df[hierarchy_df['State'] == selected_state]
-    
     # Vibrant color scale with high contrast - low delays (blue/green) to high delays (orange/red)
     vibrant_scale = [
         [0.0, '#0891b2'],   # cyan-600 (low delay - excellent)
@@ -297,57 +432,55 @@ def create_sunburst(hierarchy_df, selected_state=None):
         [1.0, '#dc2626']    # red-600 (very poor)
     ]
     
-    fig = px.sunburst(
-        hierarchy_df,
-        path=['State', 'City', 'Airport', 'Airline'],
-        values='FlightCount',
-        color='AvgDelay',
-        color_continuous_scale=vibrant_scale,
-        range_color=[0, 40],  # Set realistic delay range: 0-40 minutes
-        hover_data={
-            'FlightCount': ':,',
-            'AvgDelay': ':.1f'
-        }
-    )
+    tree = build_hierarchy_tree(hierarchy_df, ['State', 'City', 'Airport', 'Airline'])
+    
+    fig = go.Figure(go.Sunburst(
+        ids=tree['id'].to_numpy(),
+        parents=tree['parent'].to_numpy(),
+        labels=tree['label'].to_numpy(),
+        values=tree['FlightCount'].to_numpy(),
+        branchvalues='total',
+        marker=dict(
+            colors=tree['AvgDelay'].to_numpy(),
+            coloraxis='coloraxis',
+            line=dict(color='white', width=2.5)
+        ),
+        hovertemplate='<b>%{label}</b><br>' +
+                     'Flights: %{value:,}<br>' +
+                     'Avg Delay: %{color:.1f} min<extra></extra>',
+        textinfo='label+percent entry',
+        textfont=dict(size=15, color='white', family="'Inter', sans-serif", weight=600),
+        insidetextorientation='radial'
+    ))
     
     subtitle = 'Click to drill down: State → City → Airport → Airline'
     if selected_state:
         subtitle = f'Filtered: {selected_state}'
     
+    fig.update_layout(BASE_LAYOUT)
     fig.update_layout(
         title=dict(
             text=f'Flight Volume Hierarchy<br><sub>{subtitle}</sub>',
-            font=dict(size=18, color=COLORS['text']),
-            x=0.5,
-            xanchor='center'
+            font=dict(size=18)
         ),
-        paper_bgcolor=COLORS['background'],
-        plot_bgcolor=COLORS['background'],
-        font=dict(color=COLORS['text'], size=13, family="'Inter', sans-serif"),
+        font=dict(size=13, family="'Inter', sans-serif"),
         height=700,
         margin=dict(t=60, l=10, r=120, b=10),
-        coloraxis_colorbar=dict(
-            title=dict(text="Avg Delay<br>(minutes)", font=dict(size=12, color=COLORS['text'])),
-            tickfont=dict(size=11, color=COLORS['text']),
-            len=0.5,
-            thickness=15,
-            x=1.0,
-            tickmode='linear',
-            tick0=0,
-            dtick=10  # Show ticks at 0, 10, 20, 30, 40
+        coloraxis=dict(
+            colorscale=vibrant_scale,
+            cmin=0,  # Set realistic delay range: 0-40 minutes
+            cmax=40,
+            colorbar=dict(
+                title=dict(text="Avg Delay<br>(minutes)", font=dict(size=12, color=COLORS['text'])),
+                tickfont=dict(size=11, color=COLORS['text']),
+                len=0.5,
+                thickness=15,
+                x=1.0,
+                tickmode='linear',
+                tick0=0,
+                dtick=10  # Show ticks at 0, 10, 20, 30, 40
+            )
         )
     )
     
-    fig.update_traces(
-        hovertemplate='<b>%{label}</b><br>' +
-                     'Flights: %{value:,}<br>' +
-                     'Avg Delay: %{color:.1f} min<extra></extra>',
-        textinfo='label+percent entry',
-        textfont=dict(size=15, color='white', family="'Inter', sans-serif", weight=600),
-        marker=dict(
-            line=dict(color='white', width=2.5)
-        ),
-        insidetextorientation='radial'
-    )
-    
     return fig
@@ -0,0 +1,43 @@
+"""
+One-shot conversion of the aggregated CSV files to Parquet
+Run once after regenerating data/aggregated/*.csv:
+
+    python convert_to_parquet.py
+
+Numeric columns are stored as float32/int32 - none of the aggregates need
+64-bit precision, and the narrower types halve the bytes moved on load.
+"""
+
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+DATA_DIR = Path(__file__).parent / "data" / "aggregated"
+
+# 64-bit CSV inference results and the types they are stored as
+DOWNCAST_TYPES = {
+    pa.float64(): pa.float32(),
+    pa.int64(): pa.int32()
+}
+
+
+def downcast(table):
+    """Cast 64-bit numeric columns to 32-bit (raises if an integer overflows)"""
+    schema = pa.schema([
+        field.with_type(DOWNCAST_TYPES.get(field.type, field.type))
+        for field in table.schema
+    ])
+    return table.cast(schema)
+
+
+def convert_all(data_dir=DATA_DIR):
+    """Write a .parquet file next to every CSV in the data directory"""
+    for csv_path in sorted(data_dir.glob("*.csv")):
+        parquet_path = csv_path.with_suffix(".parquet")
+        pq.write_table(downcast(pv.read_csv(csv_path)), parquet_path)
+        print(f"{csv_path.name} -> {parquet_path.name}")
+
+
+if __name__ == "__main__":
+    convert_all()